@@ -26,6 +26,36 @@ STUN_SERVERS = [
 AUDIO_LANGUAGE = "ar"
 TEMP_DIR = "/tmp"
 
+# TTS Chunking Configuration
+# XTTS degrades past ~166 characters per call for Arabic, so long replies are
+# split into chunks that are rendered in parallel and stitched in order.
+# Each TTS worker holds its own copy of the XTTS model in memory.
+TTS_CHUNK_MAX_CHARS = int(os.getenv("TTS_CHUNK_MAX_CHARS", "160"))
+TTS_WORKERS = int(os.getenv("TTS_WORKERS", str(min(2, os.cpu_count() or 1))))
+# Chunks a single session may have rendering at once (fairness across sessions)
+TTS_CHUNKS_AHEAD = int(os.getenv("TTS_CHUNKS_AHEAD", "2"))
+TTS_CROSSFADE_MS = int(os.getenv("TTS_CROSSFADE_MS", "30"))
+
+# CPU Runtime Tuning (0 = derive from core count, see models/runtime.py)
+TORCH_NUM_THREADS = int(os.getenv("TORCH_NUM_THREADS", "0"))
+TORCH_INTEROP_THREADS = int(os.getenv("TORCH_INTEROP_THREADS", "1"))
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0"))
+WHISPER_NUM_WORKERS = int(os.getenv("WHISPER_NUM_WORKERS", "1"))
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "default")
+TTS_QUANTIZE_INT8 = os.getenv("TTS_QUANTIZE_INT8", "0") == "1"
+
+# Session Log Configuration (see services/session_log.py)
+SESSION_LOG_ENABLED = os.getenv("SESSION_LOG_ENABLED", "1") == "1"
+SESSION_LOG_AUDIO = os.getenv("SESSION_LOG_AUDIO", "0") == "1"
+SESSION_LOG_DIR = os.getenv("SESSION_LOG_DIR", os.path.join(TEMP_DIR, "session_logs"))
+SESSION_LOG_MAX_FILE_MB = int(os.getenv("SESSION_LOG_MAX_FILE_MB", "64"))
+SESSION_LOG_MAX_TOTAL_MB = int(os.getenv("SESSION_LOG_MAX_TOTAL_MB", "1024"))
+SESSION_LOG_BATCH_SIZE = 256
+SESSION_LOG_FLUSH_SECONDS = 1.0
+SESSION_LOG_QUEUE_SIZE = 10000
+# Audio waiting in the queue beyond this is dropped (the record is kept)
+SESSION_LOG_MAX_QUEUED_AUDIO_MB = int(os.getenv("SESSION_LOG_MAX_QUEUED_AUDIO_MB", "256"))
+
 # Gemini Configuration
 GEMINI_MODEL = "gemini-2.5-flash"
 GEMINI_SYSTEM_PROMPT = """
@@ -9,6 +9,8 @@ import config
 from models.tts_model import get_tts_model
 from models.whisper_model import get_whisper_model
 from models.llm_model import get_llm_model
+from models import runtime
+from services.session_log import get_session_log
 
 # Import routes
 from routes.ui import get_ui
@@ -30,16 +32,28 @@ async def startup_event():
     print("📦 Preloading models...")
     
     try:
+        # Size thread pools before any model spins them up
+        runtime.configure_threads()
+        footprints = {}
+        
         # Load TTS model
         print("🔊 Loading TTS model...")
+        rss_before = runtime.rss_mb()
         tts = get_tts_model()
         tts._load()  # Force load
+        runtime.quantize_tts(tts)
+        footprints["TTS"] = {
+            "rss_mb": runtime.rss_delta_mb(rss_before),
+            "weights_mb": sum(runtime.module_size_mb(m) for m in runtime.xtts_modules(tts))
+        }
         print("✅ TTS model loaded")
         
         # Load Whisper model
         print("🎤 Loading Whisper model...")
+        rss_before = runtime.rss_mb()
         whisper = get_whisper_model()
         whisper._load()  # Force load
+        footprints["Whisper"] = {"rss_mb": runtime.rss_delta_mb(rss_before)}
         print("✅ Whisper model loaded")
         
         # Load LLM model (Gemini - lightweight, just API config)
@@ -48,6 +62,10 @@ async def startup_event():
         llm._load_model()  # Force load
         print("✅ Gemini LLM loaded")
         
+        # Release load-time scratch memory back to the OS
+        runtime.trim_memory()
+        runtime.report_memory(footprints)
+        
         print("="*60)
         print("🟢 ALL MODELS LOADED AND READY!")
         print("="*60)
@@ -67,6 +85,8 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     await ws_handler.shutdown()
+    # flush queued call records
+    await asyncio.to_thread(get_session_log().close)
 
 
 @app.get("/ui")
@@ -0,0 +1,171 @@
+"""Runtime tuning for CPU inference (threads, quantization, memory)."""
+import ctypes
+import os
+import torch
+import config
+
+
+def thread_budget() -> dict:
+    """
+    Split the machine's cores between Whisper and the TTS workers.
+
+    CTranslate2 and torch each keep their own thread pools, and every TTS
+    worker thread drives its own torch intra-op team, so library defaults
+    (one thread per core each) oversubscribe the CPU. CTranslate2's
+    cpu_threads is per worker, so Whisper uses cpu_threads * num_workers.
+    When Whisper runs on GPU it gets no CPU share. Explicit config values
+    win; zero means derive from the core count.
+    """
+    # imported here: whisper_model imports this module
+    from models.whisper_model import get_whisper_model
+
+    cores = os.cpu_count() or 1
+    whisper_on_cpu = get_whisper_model().device == "cpu"
+    whisper_workers = max(1, config.WHISPER_NUM_WORKERS)
+    whisper_threads = config.WHISPER_CPU_THREADS or max(1, (cores // 2) // whisper_workers)
+    whisper_share = whisper_threads * whisper_workers if whisper_on_cpu else 0
+    tts_workers = max(1, config.TTS_WORKERS)
+    torch_threads = config.TORCH_NUM_THREADS or max(1, (cores - whisper_share) // tts_workers)
+    return {
+        "cores": cores,
+        "whisper_cpu_threads": whisper_threads,
+        "whisper_num_workers": whisper_workers,
+        "torch_intra_op_threads": torch_threads,
+        "torch_inter_op_threads": max(1, config.TORCH_INTEROP_THREADS),
+    }
+
+
+def configure_threads() -> dict:
+    """Apply the torch thread budget. Call before any model is loaded."""
+    budget = thread_budget()
+    torch.set_num_threads(budget["torch_intra_op_threads"])
+    try:
+        torch.set_num_interop_threads(budget["torch_inter_op_threads"])
+    except RuntimeError as e:
+        # only settable once, before inter-op work has started
+        print(f"⚠️ Could not set torch inter-op threads: {e}")
+    print(
+        f"🧵 Threads: {budget['cores']} cores | torch intra={budget['torch_intra_op_threads']} "
+        f"inter={budget['torch_inter_op_threads']} | whisper cpu_threads="
+        f"{budget['whisper_cpu_threads']} num_workers={budget['whisper_num_workers']}"
+    )
+    return budget
+
+
+def xtts_modules(tts) -> list:
+    """Underlying XTTS torch modules of a loaded TTSModel (one per worker)."""
+    modules = []
+    for model in getattr(tts, "models", []):
+        module = getattr(getattr(model, "synthesizer", None), "tts_model", None)
+        if module is not None:
+            modules.append(module)
+    return modules
+
+
+def _conv1d_to_linear(module) -> int:
+    """
+    Replace Hugging Face GPT-2 `Conv1D` layers with equivalent `nn.Linear`.
+
+    The XTTS GPT blocks (c_attn, c_proj, c_fc) are `Conv1D`, which computes
+    x @ W + b with W stored as (in, out), so dynamic quantization would skip
+    them. Returns the number of layers converted.
+    """
+    converted = 0
+    for name, child in module.named_children():
+        if type(child).__name__ == "Conv1D" and hasattr(child, "nf"):
+            in_features, out_features = child.weight.shape
+            linear = torch.nn.Linear(in_features, out_features, bias=child.bias is not None)
+            with torch.no_grad():
+                linear.weight.copy_(child.weight.t())
+                if child.bias is not None:
+                    linear.bias.copy_(child.bias)
+            setattr(module, name, linear)
+            converted += 1
+        else:
+            converted += _conv1d_to_linear(child)
+    return converted
+
+
+def quantize_tts(tts) -> bool:
+    """
+    Dynamically quantize the XTTS GPT module's Linear layers to int8.
+
+    GPT-2 Conv1D layers are converted to Linear first so the transformer
+    blocks are quantized too. Only applied to models on CPU and when
+    TTS_QUANTIZE_INT8 is enabled. Returns True if any module was quantized.
+    """
+    if not config.TTS_QUANTIZE_INT8:
+        return False
+    tts._load()
+    quantized = False
+    for xtts in xtts_modules(tts):
+        gpt = getattr(xtts, "gpt", None)
+        if gpt is None:
+            print("⚠️ TTS model has no GPT module, skipping int8 quantization")
+            continue
+        # dynamic int8 kernels are CPU-only; check where the model actually runs
+        device = next(gpt.parameters()).device.type
+        if device != "cpu":
+            print(f"⚠️ XTTS GPT is on {device}, skipping int8 quantization")
+            continue
+        converted = _conv1d_to_linear(gpt)
+        xtts.gpt = torch.quantization.quantize_dynamic(gpt, {torch.nn.Linear}, dtype=torch.qint8)
+        count = sum(
+            1 for m in xtts.gpt.modules()
+            if isinstance(m, torch.ao.nn.quantized.dynamic.Linear)
+        )
+        print(f"🗜️ XTTS GPT: {converted} Conv1D layers converted, {count} Linear layers quantized to int8")
+        quantized = quantized or count > 0
+    return quantized
+
+
+def module_size_mb(module) -> float:
+    """Size of a torch module's weights in MB, including packed int8 weights."""
+    if not isinstance(module, torch.nn.Module):
+        return 0.0
+    tensors = list(module.parameters()) + list(module.buffers())
+    for m in module.modules():
+        # dynamic quantized layers keep weights outside parameters/buffers
+        packed = getattr(m, "_packed_params", None)
+        if packed is not None and hasattr(packed, "_weight_bias"):
+            tensors.extend(t for t in packed._weight_bias() if t is not None)
+    return sum(t.numel() * t.element_size() for t in tensors) / 1024 ** 2
+
+
+def rss_mb():
+    """Current resident set size of this process in MB, or None if unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def rss_delta_mb(before):
+    """RSS growth since `before` (from rss_mb), or None if RSS is unavailable."""
+    after = rss_mb()
+    if before is None or after is None:
+        return None
+    return after - before
+
+
+def trim_memory():
+    """Return freed heap pages to the OS (glibc only, no-op elsewhere)."""
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def report_memory(footprints: dict):
+    """Print per-model memory footprint collected at startup."""
+    for name, info in footprints.items():
+        parts = []
+        if info.get("rss_mb") is not None:
+            parts.append(f"RSS +{info['rss_mb']:.0f} MB")
+        if info.get("weights_mb"):
+            parts.append(f"weights {info['weights_mb']:.0f} MB")
+        print(f"📊 {name}: {', '.join(parts) or 'n/a'}")
+    total = rss_mb()
+    if total is not None:
+        print(f"📊 Process RSS: {total:.0f} MB")
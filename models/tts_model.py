@@ -1,37 +1,107 @@
 """TTS Model wrapper (lazy)."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import torch
 from TTS.api import TTS
 import config
 
 _tts_instance = None
 
 class TTSModel:
-    """Light wrapper for TTS with lazy loading."""
+    """
+    Light wrapper for TTS with lazy loading.
+
+    XTTS keeps per-call state on the model (the GPT conditioning prefix), so
+    a single instance must never run two syntheses at once. Each thread of
+    `executor` therefore owns its own model; run synthesis on the executor.
+    """
 
     def __init__(self):
-        # don't load heavy model on instantiation
-        self._model = None
+        # don't load heavy models on instantiation
+        self.workers = max(1, config.TTS_WORKERS)
+        self.models = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # one model per thread, so reply chunks render in parallel safely
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="tts"
+        )
 
-    def _load(self):
-        if self._model is None:
-            print("🔊 Loading Arabic TTS model...")
-            self._model = TTS(
-                model_path=config.TTS_MODEL_PATH,
-                config_path=config.TTS_CONFIG_PATH
-            )
+    def _thread_model(self) -> TTS:
+        """Return the calling thread's model, loading it on first use."""
+        model = getattr(self._local, "model", None)
+        if model is None:
+            # serialize loads: concurrent checkpoint loading spikes memory
+            with self._lock:
+                print(f"🔊 Loading Arabic TTS model ({threading.current_thread().name})...")
+                model = TTS(
+                    model_path=config.TTS_MODEL_PATH,
+                    config_path=config.TTS_CONFIG_PATH
+                )
+                self.models.append(model)
+            self._local.model = model
             print("✅ TTS model loaded.")
+        return model
+
+    def _load(self):
+        """Load one model on every executor thread (blocking, call off-pool)."""
+        if len(self.models) >= self.workers:
+            return
+        # the barrier keeps each warm-up task on a distinct thread
+        barrier = threading.Barrier(self.workers)
+
+        def warm():
+            try:
+                self._thread_model()
+            except Exception:
+                # release the threads already waiting so _load fails, not hangs
+                barrier.abort()
+                raise
+            barrier.wait()
+
+        error = None
+        for future in [self.executor.submit(warm) for _ in range(self.workers)]:
+            try:
+                future.result()
+            except threading.BrokenBarrierError:
+                pass
+            except Exception as e:
+                error = error or e
+        if error:
+            raise error
 
+    @property
+    def sample_rate(self) -> int:
+        """Output sample rate of the loaded models (never loads; read after synthesis)."""
+        if not self.models:
+            raise RuntimeError("TTS model not loaded")
+        return self.models[0].synthesizer.output_sample_rate
+
+    @torch.inference_mode()
     def synthesize(self, text: str, output_path: str, speaker_wav: str = None):
-        """Synthesize text to an audio file (lazy loads model)."""
+        """Synthesize text to an audio file (run on `executor`)."""
         speaker_wav = speaker_wav or config.REFERENCE_WAV
-        self._load()
         # use model's tts_to_file (keeps existing API)
-        self._model.tts_to_file(
+        self._thread_model().tts_to_file(
             text=text,
             file_path=output_path,
             speaker_wav=speaker_wav,
             language=config.AUDIO_LANGUAGE
         )
 
+    @torch.inference_mode()
+    def synthesize_array(self, text: str, speaker_wav: str = None) -> np.ndarray:
+        """Synthesize text to float32 samples at `sample_rate` (run on `executor`)."""
+        speaker_wav = speaker_wav or config.REFERENCE_WAV
+        wav = self._thread_model().tts(
+            text=text,
+            speaker_wav=speaker_wav,
+            language=config.AUDIO_LANGUAGE
+        )
+        return np.asarray(wav, dtype=np.float32)
+
 def get_tts_model() -> TTSModel:
     """Return a global TTSModel singleton (lazy)."""
     global _tts_instance
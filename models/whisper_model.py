@@ -1,6 +1,7 @@
 """Whisper model wrapper (lazy)."""
 import torch
 from faster_whisper import WhisperModel
+from models.runtime import thread_budget
 import config
 
 _whisper_instance = None
@@ -14,7 +15,14 @@ class WhisperASR:
     def _load(self):
         if self.model is None:
             print(f"🎤 Loading Whisper model ({config.WHISPER_MODEL_SIZE}) on {self.device}...")
-            self.model = WhisperModel(config.WHISPER_MODEL_SIZE, device=self.device)
+            budget = thread_budget()
+            self.model = WhisperModel(
+                config.WHISPER_MODEL_SIZE,
+                device=self.device,
+                compute_type=config.WHISPER_COMPUTE_TYPE,
+                cpu_threads=budget["whisper_cpu_threads"],
+                num_workers=budget["whisper_num_workers"]
+            )
             print("✅ Whisper model loaded")
 
     def transcribe(self, audio_path: str, language: str = "ar") -> str:
@@ -2,6 +2,7 @@
 import os
 import asyncio
 import tempfile
+import time
 import traceback
 from fastapi import WebSocket, WebSocketDisconnect
 from aiortc import RTCSessionDescription
@@ -9,6 +10,7 @@ from aiortc.contrib.media import MediaPlayer
 
 from services.conversation import ConversationSession
 from services.audio_processor import get_audio_processor
+from services.session_log import get_session_log
 from utils.webrtc import create_peer_connection, parse_ice_candidate
 import config
 
@@ -18,6 +20,7 @@ class WebSocketHandler:
     def __init__(self):
         self.pcs = set()
         self.audio_processor = get_audio_processor()
+        self.session_log = get_session_log()
         # Get references to preloaded models
         self._tts = None
         self._llm = None
@@ -82,7 +85,10 @@ class WebSocketHandler:
             if text and text.strip():
                 print(f"📝 Text mode - synthesizing: '{text}'")
                 temp_audio = os.path.join(config.TEMP_DIR, f"output_{id(pc)}.wav")
-                self._get_tts().synthesize(text=text, output_path=temp_audio)
+                tts = self._get_tts()
+                await asyncio.get_running_loop().run_in_executor(
+                    tts.executor, tts.synthesize, text, temp_audio
+                )
                 player = MediaPlayer(temp_audio)
                 pc.addTrack(player.audio)
             else:
@@ -137,17 +143,31 @@ class WebSocketHandler:
     async def _handle_voice_input(self, data: dict, websocket: WebSocket, session):
         try:
             print("🎤 Processing voice input...")
+            session_id = session.session_id if session else f"ws-{id(websocket)}"
+            started = time.perf_counter()
             text_input = await self.audio_processor.process_audio_input(data.get("audio"))
+            asr_ms = (time.perf_counter() - started) * 1000
             await websocket.send_json({"type": "transcription", "text": text_input})
 
             if not text_input.strip():
                 await websocket.send_json({"type": "error", "message": "No speech detected"})
+                self.session_log.log(
+                    "user_turn", session_id, audio={"input": data.get("audio")},
+                    transcript="", asr_ms=round(asr_ms, 1)
+                )
                 return
 
             # LLM (already preloaded)
             llm = self._get_llm()
+            started = time.perf_counter()
             response_text = await llm.generate_response(text_input)
+            llm_ms = (time.perf_counter() - started) * 1000
             await websocket.send_json({"type": "llm_response", "text": response_text})
+            self.session_log.log(
+                "user_turn", session_id, audio={"input": data.get("audio")},
+                transcript=text_input, reply=response_text,
+                asr_ms=round(asr_ms, 1), llm_ms=round(llm_ms, 1)
+            )
 
             # Queue TTS for playback
             if session:
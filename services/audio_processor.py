@@ -1,4 +1,5 @@
 """Audio processing utilities (lazy whisper)."""
+import asyncio
 import base64
 import tempfile
 import os
@@ -21,7 +22,8 @@ class AudioProcessor:
 
         try:
             whisper = get_whisper_model()  # lazy load on first call
-            text = whisper.transcribe(temp_path)
+            # off the event loop so WHISPER_NUM_WORKERS can run in parallel
+            text = await asyncio.to_thread(whisper.transcribe, temp_path)
             return text
         finally:
             if os.path.exists(temp_path):
@@ -1,11 +1,13 @@
 """Conversation session management."""
 import asyncio
-import os
 import base64
-import tempfile
+import time
 import traceback
+import uuid
 from fastapi import WebSocket
 from models.tts_model import get_tts_model
+from services.session_log import get_session_log
+from utils.audio import split_text, crossfade, wav_bytes
 import config
 
 
@@ -21,12 +23,14 @@ class ConversationSession:
             speaker_wav: Path to reference speaker audio
             websocket: WebSocket connection for updates
         """
+        self.session_id = uuid.uuid4().hex
         self.pc = pc
         self.speaker_wav = speaker_wav or config.REFERENCE_WAV
         self.websocket = websocket
         self.audio_queue = asyncio.Queue()
         self.active = True
         self.tts_model = get_tts_model()
+        self.session_log = get_session_log()
         self._task = asyncio.create_task(self._run())
     
     async def enqueue(self, text: str):
@@ -41,6 +45,90 @@ class ConversationSession:
             except Exception as e:
                 print(f"⚠️ WebSocket send failed: {e}")
     
+    async def _synthesize_chunks(self, text: str):
+        """
+        Render text in chunks and stream them to the client in order.
+
+        Chunks are rendered in parallel on the TTS executor, at most
+        TTS_CHUNKS_AHEAD at a time per session so one long reply cannot
+        starve other sessions of workers. Each chunk is sent as soon as it
+        and all of its predecessors are ready; the last few milliseconds of
+        every chunk are held back and crossfaded into the start of the next.
+        """
+        chunks = split_text(text, config.TTS_CHUNK_MAX_CHARS) or [text]
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        ahead = max(1, config.TTS_CHUNKS_AHEAD)
+        futures = []
+
+        def submit_next():
+            if len(futures) < len(chunks):
+                futures.append(loop.run_in_executor(
+                    self.tts_model.executor,
+                    self.tts_model.synthesize_array,
+                    chunks[len(futures)],
+                    self.speaker_wav
+                ))
+
+        for _ in range(ahead):
+            submit_next()
+        if len(chunks) > 1:
+            print(f"✂️ Split reply into {len(chunks)} chunks")
+
+        try:
+            sample_rate = None
+            tail = None
+            first_chunk_ms = None
+            sent_samples = []
+
+            for index in range(len(chunks)):
+                samples = await futures[index]
+                # slide the window: keep `ahead` chunks in flight
+                submit_next()
+                if sample_rate is None:
+                    # a finished chunk means a model is loaded; never load on the loop
+                    sample_rate = self.tts_model.sample_rate
+                    fade_samples = int(sample_rate * config.TTS_CROSSFADE_MS / 1000)
+                if tail is not None:
+                    samples = crossfade(tail, samples)
+
+                is_final = index == len(chunks) - 1
+                if not is_final and fade_samples and len(samples) > fade_samples:
+                    samples, tail = samples[:-fade_samples], samples[-fade_samples:]
+                else:
+                    tail = None
+
+                if self.session_log.log_audio:
+                    sent_samples.append(samples)
+                audio_data = wav_bytes(samples, sample_rate)
+                audio_base64 = base64.b64encode(audio_data).decode('utf-8')
+                print(f"📦 Sending audio chunk {index + 1}/{len(chunks)}: {len(audio_data)} bytes")
+
+                await self._send_ws_message({
+                    "type": "tts_generated",
+                    "file_size": len(audio_data),
+                    "audio_data": audio_base64,
+                    "chunk_index": index,
+                    "chunk_count": len(chunks),
+                    "is_final": is_final
+                })
+                if first_chunk_ms is None:
+                    first_chunk_ms = (time.perf_counter() - started) * 1000
+
+            self.session_log.log(
+                "tts",
+                self.session_id,
+                audio={"reply": (sent_samples, sample_rate)} if sent_samples else None,
+                text=text,
+                chunk_count=len(chunks),
+                first_chunk_ms=round(first_chunk_ms, 1),
+                total_ms=round((time.perf_counter() - started) * 1000, 1)
+            )
+        finally:
+            # Drop chunks not yet rendered if we failed or were cancelled
+            for future in futures:
+                future.cancel()
+
     async def _run(self):
         """Main loop for processing audio generation queue."""
         while self.active:
@@ -53,37 +141,12 @@ class ConversationSession:
                     "text_length": len(text)
                 })
                 
-                # Generate unique temp file
-                temp_audio = os.path.join(
-                    config.TEMP_DIR,
-                    f"conv_{id(self.pc)}_{int(asyncio.get_event_loop().time()*1000)}.wav"
-                )
-                
                 try:
-                    # Generate TTS audio
-                    self.tts_model.synthesize(
-                        text=text,
-                        output_path=temp_audio,
-                        speaker_wav=self.speaker_wav
-                    )
-                    
-                    file_size = os.path.getsize(temp_audio)
-                    
-                    # Read and encode audio as base64
-                    with open(temp_audio, 'rb') as f:
-                        audio_data = f.read()
-                        audio_base64 = base64.b64encode(audio_data).decode('utf-8')
-                    
-                    print(f"📦 Sending audio: {len(audio_base64)} chars base64, {file_size} bytes")
-                    
-                    await self._send_ws_message({
-                        "type": "tts_generated",
-                        "file_size": file_size,
-                        "audio_data": audio_base64
-                    })
-                    
+                    await self._synthesize_chunks(text)
                     print(f"✅ TTS audio sent to client")
                     
+                except asyncio.CancelledError:
+                    raise
                 except Exception as e:
                     print(f"❌ TTS generation failed: {e}")
                     traceback.print_exc()
@@ -91,14 +154,6 @@ class ConversationSession:
                         "type": "error",
                         "message": f"TTS generation failed: {str(e)}"
                     })
-                    
-                finally:
-                    # Cleanup temp file
-                    if os.path.exists(temp_audio):
-                        try:
-                            os.unlink(temp_audio)
-                        except Exception:
-                            pass
             
             except asyncio.CancelledError:
                 break
@@ -0,0 +1,265 @@
+"""Append-only session log (transcripts, replies, timings, optional audio)."""
+import base64
+import json
+import os
+import queue
+import threading
+import time
+import traceback
+from pathlib import Path
+import numpy as np
+from utils.audio import wav_bytes
+import config
+
+_STOP = object()
+
+
+class SessionLog:
+    """
+    Batched, rotating session log written by a background thread.
+
+    `log()` only enqueues, so it is safe to call from the event loop. The
+    writer thread drains the queue in batches into JSONL segments and, for
+    audio payloads, an append-only binary segment referenced by offset from
+    the JSONL record. Segments rotate before a record would push either file
+    past SESSION_LOG_MAX_FILE_MB, and the oldest are deleted once the
+    directory exceeds SESSION_LOG_MAX_TOTAL_MB.
+    """
+
+    def __init__(self, log_dir: str = None):
+        self.log_dir = Path(log_dir or config.SESSION_LOG_DIR)
+        self.enabled = config.SESSION_LOG_ENABLED
+        self.log_audio = self.enabled and config.SESSION_LOG_AUDIO
+        self.dropped = 0
+        self.audio_dropped = 0
+        self._queue = queue.Queue(maxsize=config.SESSION_LOG_QUEUE_SIZE)
+        self._queued_audio_bytes = 0
+        self._thread = None
+        self._lock = threading.Lock()
+        self._jsonl = None
+        self._audio = None
+        self._jsonl_size = 0
+        self._audio_size = 0
+        self._segment = 0
+
+    def log(self, event: str, session_id: str, audio: dict = None, **fields):
+        """
+        Queue a record without blocking; drops it if the writer is behind.
+
+        Args:
+            event: Record type (e.g. "user_turn", "tts")
+            session_id: Conversation session identifier
+            audio: Optional {label: payload}; payload is WAV bytes, a base64
+                string or a (samples, sample_rate) tuple where samples may be
+                a list of arrays to concatenate. Encoded off-loop. Dropped
+                (keeping the record) while queued audio is over
+                SESSION_LOG_MAX_QUEUED_AUDIO_MB.
+            **fields: JSON-serializable record fields
+        """
+        if not self.enabled:
+            return
+        self._ensure_started()
+        record = {"ts": time.time(), "event": event, "session_id": session_id, **fields}
+        audio_bytes = 0
+        if audio and self.log_audio:
+            audio_bytes = sum(_payload_size(payload) for payload in audio.values())
+            budget = config.SESSION_LOG_MAX_QUEUED_AUDIO_MB * 1024 ** 2
+            with self._lock:
+                if self._queued_audio_bytes + audio_bytes <= budget:
+                    self._queued_audio_bytes += audio_bytes
+                    record["_audio"] = audio
+                    record["_audio_bytes"] = audio_bytes
+                else:
+                    audio_bytes = 0
+            if "_audio" not in record:
+                self.audio_dropped += 1
+                record["audio_dropped"] = True
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self._release_audio(audio_bytes)
+
+    def close(self):
+        """Flush pending records and stop the writer thread (blocking)."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        if self.dropped:
+            print(f"⚠️ Session log dropped {self.dropped} records")
+        if self.audio_dropped:
+            print(f"⚠️ Session log dropped audio from {self.audio_dropped} records")
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._writer, name="session-log", daemon=True
+                    )
+                    self._thread.start()
+
+    def _release_audio(self, audio_bytes: int):
+        if audio_bytes:
+            with self._lock:
+                self._queued_audio_bytes -= audio_bytes
+
+    def _writer(self):
+        """Background loop: drain the queue in batches and write them."""
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        running = True
+        while running:
+            try:
+                batch = [self._queue.get(timeout=config.SESSION_LOG_FLUSH_SECONDS)]
+            except queue.Empty:
+                continue
+            while len(batch) < config.SESSION_LOG_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in batch:
+                batch = [r for r in batch if r is not _STOP]
+                running = False
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                print(f"❌ Session log write failed: {e}")
+                traceback.print_exc()
+        self._close_segment()
+
+    def _write_batch(self, batch: list):
+        for record in batch:
+            # one bad record must not cost the rest of the batch
+            try:
+                self._write_record(record)
+            except Exception as e:
+                self.dropped += 1
+                print(f"⚠️ Session log dropped a {record.get('event')} record: {e}")
+            finally:
+                self._release_audio(record.pop("_audio_bytes", 0))
+        if self._jsonl is not None:
+            self._jsonl.flush()
+            self._audio.flush()
+
+    def _write_record(self, record: dict):
+        """
+        Append one record, rotating first if it would overflow the segment.
+
+        Audio is encoded and the record serialized before anything is
+        written, so a record that fails leaves no orphaned audio bytes.
+        """
+        blobs = [(label, self._audio_bytes(payload))
+                 for label, payload in (record.pop("_audio", None) or {}).items()]
+        audio_size = sum(len(data) for _, data in blobs)
+
+        self._open_segment()
+        max_bytes = config.SESSION_LOG_MAX_FILE_MB * 1024 ** 2
+        segment_used = self._jsonl_size or self._audio_size
+        if segment_used and (
+            self._audio_size + audio_size > max_bytes or self._jsonl_size >= max_bytes
+        ):
+            self._rotate()
+
+        if blobs:
+            refs = {}
+            offset = self._audio_size
+            for label, data in blobs:
+                refs[label] = {
+                    "file": Path(self._audio.name).name,
+                    "offset": offset,
+                    "length": len(data)
+                }
+                offset += len(data)
+            record["audio"] = refs
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+        for _, data in blobs:
+            self._audio.write(data)
+        self._audio_size += audio_size
+        self._jsonl.write(line)
+        self._jsonl_size += len(line.encode("utf-8"))
+
+    def _audio_bytes(self, payload) -> bytes:
+        """Encode one audio payload as bytes."""
+        if isinstance(payload, str):
+            return base64.b64decode(payload)
+        if isinstance(payload, tuple):
+            samples, sample_rate = payload
+            if isinstance(samples, list):
+                samples = np.concatenate(samples)
+            return wav_bytes(samples, sample_rate)
+        return bytes(payload)
+
+    def _rotate(self):
+        self._close_segment()
+        self._enforce_total_cap()
+        self._open_segment()
+
+    def _open_segment(self):
+        if self._jsonl is not None:
+            return
+        self._segment += 1
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        name = f"{stamp}-{os.getpid()}-{self._segment:04d}"
+        self._jsonl = open(self.log_dir / f"session-{name}.jsonl", "a", encoding="utf-8")
+        self._audio = open(self.log_dir / f"audio-{name}.bin", "ab")
+        self._jsonl_size = self._audio_size = 0
+
+    def _close_segment(self):
+        for f in (self._jsonl, self._audio):
+            if f is not None:
+                f.close()
+        self._jsonl = self._audio = None
+
+    def _enforce_total_cap(self):
+        """
+        Delete the oldest closed segments until under the total size cap.
+
+        A segment's session-X.jsonl and audio-X.bin are removed together so
+        no record is left pointing at missing audio. Room is left for the
+        segment about to be opened, and the newest closed segment is always
+        kept, even if it alone exceeds the cap.
+        """
+        cap = max(0, config.SESSION_LOG_MAX_TOTAL_MB - config.SESSION_LOG_MAX_FILE_MB) * 1024 ** 2
+        segments = {}
+        for path in self.log_dir.iterdir():
+            for prefix, suffix in (("session-", ".jsonl"), ("audio-", ".bin")):
+                if path.name.startswith(prefix) and path.suffix == suffix:
+                    name = path.name[len(prefix):-len(suffix)]
+                    segments.setdefault(name, []).append(path)
+
+        sizes = {
+            name: sum(p.stat().st_size for p in paths) for name, paths in segments.items()
+        }
+        total = sum(sizes.values())
+        # names start with a timestamp, so they sort oldest first
+        for name in sorted(segments)[:-1]:
+            if total <= cap:
+                break
+            for path in segments[name]:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= sizes[name]
+
+
+def _payload_size(payload) -> int:
+    """Approximate memory held by a queued audio payload, in bytes."""
+    if isinstance(payload, tuple):
+        samples = payload[0]
+        arrays = samples if isinstance(samples, list) else [samples]
+        return sum(getattr(a, "nbytes", 0) for a in arrays)
+    return len(payload)
+
+
+_session_log_instance = None
+
+def get_session_log() -> SessionLog:
+    global _session_log_instance
+    if _session_log_instance is None:
+        _session_log_instance = SessionLog()
+    return _session_log_instance
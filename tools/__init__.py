@@ -0,0 +1 @@
+"""Developer tools package."""
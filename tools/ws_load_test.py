@@ -0,0 +1,487 @@
+"""
+WebSocket load generator for the voice assistant.
+
+Opens N concurrent `/ws` connections, performs the `webrtc_offer` handshake
+and sends `voice_input` clips on a configurable arrival schedule, recording
+per-message latency for each response stage plus error rates.
+
+By default `main.app` is served from a separate subprocess with stub ASR,
+LLM and TTS models (and the session log disabled), so the test runs offline
+and measures the serving path (event loop, WebRTC, websocket framing,
+chunked TTS streaming) rather than model quality. Keeping the server out of
+the clients' process stops client-side work (ICE/DTLS, base64 decoding)
+from showing up as server latency. Pass `--url` to target an already
+running server instead, or `--serve-stubs` to run only the stubbed server.
+
+Usage:
+    python -m tools.ws_load_test --clients 20 --messages 5 --interval 2
+    python -m tools.ws_load_test --clients 50 --arrival poisson --json out.json
+    python -m tools.ws_load_test --url ws://host:8080/ws --clips recordings/
+    python -m tools.ws_load_test --serve-stubs --port 8765
+    python -m tools.ws_load_test --server-log server.log
+"""
+import argparse
+import asyncio
+import base64
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import websockets
+from aiortc import RTCConfiguration, RTCPeerConnection, RTCSessionDescription
+
+import config
+from utils.audio import wav_bytes
+
+STAGES = ["transcription", "llm_response", "tts_first", "tts_final"]
+
+
+# ---------------------------------------------------------------------------
+# Stub models (offline mode)
+# ---------------------------------------------------------------------------
+
+class StubWhisper:
+    """Stands in for WhisperASR; blocks like the real synchronous call."""
+
+    def __init__(self, latency_s: float, text: str):
+        self.latency_s = latency_s
+        self.text = text
+
+    def _load(self):
+        pass
+
+    def transcribe(self, audio_path: str, language: str = "ar") -> str:
+        time.sleep(self.latency_s)
+        return self.text
+
+
+class StubLLM:
+    """Stands in for GeminiLLM with a fixed-length reply."""
+
+    def __init__(self, latency_s: float, reply_chars: int):
+        self.latency_s = latency_s
+        words = ("أهلا بيك يا فندم " * (reply_chars // 16 + 1)).split()
+        reply = ""
+        for i, word in enumerate(words):
+            if len(reply) + len(word) + 1 > reply_chars:
+                break
+            # sentence break every few words so the chunker has boundaries
+            reply += word + ("، " if i % 8 == 7 else " ")
+        self.reply = reply.strip()
+
+    def _load_model(self):
+        pass
+
+    async def generate_response(self, user_text: str) -> str:
+        await asyncio.sleep(self.latency_s)
+        return self.reply
+
+
+class StubTTS:
+    """Stands in for TTSModel; renders silence after a fixed delay per call."""
+
+    sample_rate = 24000
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+        self.executor = ThreadPoolExecutor(
+            max_workers=max(1, config.TTS_WORKERS),
+            thread_name_prefix="tts"
+        )
+
+    def _load(self):
+        pass
+
+    def synthesize_array(self, text: str, speaker_wav: str = None) -> np.ndarray:
+        time.sleep(self.latency_s)
+        # ~12 characters per second of speech
+        duration = max(0.2, len(text) / 12)
+        return np.zeros(int(self.sample_rate * duration), dtype=np.float32)
+
+    def synthesize(self, text: str, output_path: str, speaker_wav: str = None):
+        with open(output_path, "wb") as f:
+            f.write(wav_bytes(self.synthesize_array(text), self.sample_rate))
+
+
+def install_stubs(args):
+    """Swap the model singletons for stubs before the app touches them."""
+    import models.whisper_model as whisper_model
+    import models.llm_model as llm_model
+    import models.tts_model as tts_model
+
+    whisper_model._whisper_instance = StubWhisper(args.asr_ms / 1000, "عايز أعرف مواعيد الفرع")
+    llm_model._llm_instance = StubLLM(args.llm_ms / 1000, args.reply_chars)
+    tts_model._tts_instance = StubTTS(args.tts_ms / 1000)
+    # no network in offline mode: host candidates only
+    config.STUN_SERVERS = []
+    # don't fill the session log with synthetic traffic
+    config.SESSION_LOG_ENABLED = False
+
+
+# ---------------------------------------------------------------------------
+# Clients
+# ---------------------------------------------------------------------------
+
+class Request:
+    """One voice_input message and the time each response stage arrived."""
+
+    def __init__(self, sent_at: float):
+        self.sent_at = sent_at
+        self.stages = {}
+        self.error = None
+        self.done = False
+
+    def mark(self, stage: str):
+        if stage not in self.stages:
+            self.stages[stage] = time.perf_counter() - self.sent_at
+
+
+class VoiceClient:
+    """A single simulated browser: one websocket + one peer connection."""
+
+    def __init__(self, client_id: int, url: str, clips: list, args):
+        self.client_id = client_id
+        self.url = url
+        self.clips = clips
+        self.args = args
+        self.requests = []
+        self.pending = deque()
+        self.connect_error = None
+        self._answer = None
+
+    def _next_delay(self) -> float:
+        if self.args.arrival == "poisson":
+            return random.expovariate(1.0 / self.args.interval)
+        return self.args.interval
+
+    async def run(self):
+        # no STUN: aiortc would otherwise fall back to Google's server
+        pc = RTCPeerConnection(configuration=RTCConfiguration(iceServers=[]))
+        try:
+            async with websockets.connect(self.url, max_size=None) as ws:
+                receiver = asyncio.create_task(self._receive(ws))
+                try:
+                    await self._handshake(ws, pc)
+                    await self._send_clips(ws)
+                    await self._drain()
+                finally:
+                    receiver.cancel()
+                    await asyncio.gather(receiver, return_exceptions=True)
+        except Exception as e:
+            self.connect_error = self.connect_error or f"{type(e).__name__}: {e}"
+        finally:
+            await pc.close()
+            # whatever is still pending never completed
+            for req in self.pending:
+                req.error = req.error or "timeout"
+                req.done = True
+
+    async def _handshake(self, ws, pc):
+        pc.createDataChannel("keepalive")
+        pc.addTransceiver("audio", direction="recvonly")
+        offer = await pc.createOffer()
+        await pc.setLocalDescription(offer)
+
+        self._answer = asyncio.get_running_loop().create_future()
+        await ws.send(json.dumps({
+            "type": "webrtc_offer",
+            "offer": {"sdp": pc.localDescription.sdp, "type": pc.localDescription.type}
+        }))
+        answer = await asyncio.wait_for(self._answer, self.args.timeout)
+        await pc.setRemoteDescription(RTCSessionDescription(sdp=answer["sdp"], type=answer["type"]))
+
+    async def _send_clips(self, ws):
+        for i in range(self.args.messages):
+            if i:
+                await asyncio.sleep(self._next_delay())
+            req = Request(time.perf_counter())
+            self.requests.append(req)
+            self.pending.append(req)
+            await ws.send(json.dumps({
+                "type": "voice_input",
+                "audio": self.clips[(self.client_id + i) % len(self.clips)]
+            }))
+
+    async def _drain(self):
+        deadline = time.perf_counter() + self.args.timeout
+        while self.pending and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+
+    def _first_pending(self, missing: str = None, reached: str = None):
+        for req in self.pending:
+            if req.done or (missing and missing in req.stages):
+                continue
+            if reached and reached not in req.stages:
+                continue
+            return req
+        return None
+
+    def _complete(self, req):
+        req.done = True
+        while self.pending and self.pending[0].done:
+            self.pending.popleft()
+
+    async def _receive(self, ws):
+        # Responses arrive in order per connection, so each one belongs to
+        # the oldest request that has not reached that stage yet.
+        async for raw in ws:
+            data = json.loads(raw)
+            msg_type = data.get("type")
+
+            if msg_type == "sdp_answer":
+                if self._answer and not self._answer.done():
+                    self._answer.set_result(data["answer"])
+            elif msg_type in ("transcription", "llm_response"):
+                req = self._first_pending(msg_type)
+                if req:
+                    req.mark(msg_type)
+            elif msg_type == "tts_generated":
+                req = self._first_pending("tts_final")
+                if req:
+                    req.mark("tts_first")
+                    if data.get("is_final", True):
+                        req.mark("tts_final")
+                        self._complete(req)
+            elif msg_type == "error":
+                message = data.get("message") or "error"
+                if self._answer and not self._answer.done():
+                    self._answer.set_exception(RuntimeError(message))
+                    continue
+                if message.startswith("TTS generation failed"):
+                    # playback errors belong to the oldest reply being spoken
+                    req = self._first_pending("tts_final", reached="llm_response") or self._first_pending()
+                elif message == "No speech detected":
+                    # sent right after that request's transcription
+                    req = self._first_pending("llm_response", reached="transcription")
+                else:
+                    # voice handler errors: the request still before its LLM reply
+                    req = self._first_pending("llm_response")
+                if req:
+                    req.error = message
+                    self._complete(req)
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(clients: list, elapsed: float) -> dict:
+    requests = [req for c in clients for req in c.requests]
+    errors = {}
+    for req in requests:
+        if req.error:
+            errors[req.error] = errors.get(req.error, 0) + 1
+
+    stages = {}
+    for stage in STAGES:
+        values = [req.stages[stage] for req in requests if stage in req.stages]
+        stages[stage] = {
+            "count": len(values),
+            "mean": sum(values) / len(values) if values else float("nan"),
+            "p50": _percentile(values, 50),
+            "p90": _percentile(values, 90),
+            "p99": _percentile(values, 99),
+            "max": max(values) if values else float("nan"),
+        }
+
+    completed = sum(1 for req in requests if "tts_final" in req.stages and not req.error)
+    return {
+        "clients": len(clients),
+        "connect_errors": sum(1 for c in clients if c.connect_error),
+        "requests": len(requests),
+        "completed": completed,
+        "error_rate": (len(requests) - completed) / len(requests) if requests else 0.0,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "throughput_rps": completed / elapsed if elapsed else 0.0,
+        "latency_s": stages,
+    }
+
+
+def print_report(summary: dict):
+    print("=" * 60)
+    print(f"👥 Clients: {summary['clients']}  (connect errors: {summary['connect_errors']})")
+    print(f"📨 Requests: {summary['requests']}  completed: {summary['completed']}  "
+          f"error rate: {summary['error_rate']:.1%}")
+    print(f"⏱️ Elapsed: {summary['elapsed_s']:.1f}s  throughput: {summary['throughput_rps']:.2f} req/s")
+    print("-" * 60)
+    print(f"{'stage':<14}{'count':>7}{'mean':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}")
+    for stage, s in summary["latency_s"].items():
+        print(f"{stage:<14}{s['count']:>7}{s['mean']:>9.3f}{s['p50']:>9.3f}"
+              f"{s['p90']:>9.3f}{s['p99']:>9.3f}{s['max']:>9.3f}")
+    if summary["errors"]:
+        print("-" * 60)
+        for message, count in sorted(summary["errors"].items(), key=lambda kv: -kv[1]):
+            print(f"❌ {count} × {message}")
+    print("=" * 60)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def load_clips(paths: list) -> list:
+    """Return base64 WAV clips from files/directories, or one second of silence."""
+    files = []
+    for path in map(Path, paths or []):
+        files.extend(sorted(path.glob("*.wav")) if path.is_dir() else [path])
+    if not files:
+        silence = wav_bytes(np.zeros(16000, dtype=np.float32), 16000)
+        return [base64.b64encode(silence).decode("utf-8")]
+    return [base64.b64encode(f.read_bytes()).decode("utf-8") for f in files]
+
+
+def serve_stubs(args):
+    """Run main.app with stub models until interrupted (server process)."""
+    import uvicorn
+    install_stubs(args)
+    from main import app
+
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+def _free_port() -> int:
+    """Ask the OS for an unused local port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _start_server(args, port: int):
+    """Spawn the stubbed server in a subprocess and wait until it listens."""
+    # keep the server's per-message prints out of the client terminal
+    output = open(args.server_log, "ab") if args.server_log else subprocess.DEVNULL
+    try:
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "tools.ws_load_test", "--serve-stubs",
+            "--port", str(port),
+            "--asr-ms", str(args.asr_ms),
+            "--llm-ms", str(args.llm_ms),
+            "--tts-ms", str(args.tts_ms),
+            "--reply-chars", str(args.reply_chars),
+            cwd=str(Path(__file__).resolve().parent.parent),
+            stdout=output,
+            stderr=output
+        )
+    finally:
+        if args.server_log:
+            output.close()
+
+    deadline = time.perf_counter() + args.timeout
+    while time.perf_counter() < deadline:
+        if process.returncode is not None:
+            raise RuntimeError(f"Stub server exited with code {process.returncode}")
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            await writer.wait_closed()
+        except OSError:
+            await asyncio.sleep(0.2)
+            continue
+        # something answered; make sure it is our server, not a stray listener
+        await asyncio.sleep(0.2)
+        if process.returncode is not None:
+            raise RuntimeError(f"Stub server exited with code {process.returncode}")
+        return process
+    process.terminate()
+    await process.wait()
+    raise RuntimeError("Stub server did not start in time")
+
+
+async def run(args) -> dict:
+    server = None
+    url = args.url
+    if url is None:
+        port = args.port or _free_port()
+        server = await _start_server(args, port)
+        url = f"ws://127.0.0.1:{port}/ws"
+
+    clips = load_clips(args.clips)
+    clients = [VoiceClient(i, url, clips, args) for i in range(args.clients)]
+
+    async def start(client):
+        # stagger connection arrivals across the ramp window
+        await asyncio.sleep(args.ramp * client.client_id / max(1, args.clients))
+        await client.run()
+
+    print(f"🚀 {args.clients} clients × {args.messages} messages against {url}")
+    started = time.perf_counter()
+    load = asyncio.ensure_future(asyncio.gather(*(start(c) for c in clients)))
+    try:
+        if server:
+            # abort the run if the server dies rather than measuring errors
+            server_exit = asyncio.ensure_future(server.wait())
+            await asyncio.wait({load, server_exit}, return_when=asyncio.FIRST_COMPLETED)
+            if not load.done():
+                load.cancel()
+                await asyncio.gather(load, return_exceptions=True)
+                raise RuntimeError(f"Stub server exited with code {server.returncode} during the run")
+            server_exit.cancel()
+        await load
+    finally:
+        elapsed = time.perf_counter() - started
+        if server and server.returncode is None:
+            server.terminate()
+            await server.wait()
+
+    for client in clients:
+        if client.connect_error:
+            print(f"⚠️ Client {client.client_id}: {client.connect_error}")
+    return summarize(clients, elapsed)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent WebSocket voice clients.")
+    parser.add_argument("--url", help="Target ws:// URL (default: spawn main.app with stubs)")
+    parser.add_argument("--port", type=int, default=0,
+                        help="Port for the stubbed server (default: pick a free port)")
+    parser.add_argument("--server-log", help="Write the stubbed server's output here (default: discard)")
+    parser.add_argument("--serve-stubs", action="store_true",
+                        help="Only run the stubbed server (used by the spawned subprocess)")
+    parser.add_argument("--clients", type=int, default=10, help="Concurrent connections")
+    parser.add_argument("--messages", type=int, default=3, help="voice_input messages per client")
+    parser.add_argument("--interval", type=float, default=2.0, help="Mean seconds between messages")
+    parser.add_argument("--arrival", choices=["fixed", "poisson"], default="fixed",
+                        help="Inter-message arrival schedule")
+    parser.add_argument("--ramp", type=float, default=1.0, help="Seconds over which clients connect")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for outstanding replies")
+    parser.add_argument("--clips", nargs="*", help="WAV files or directories to send")
+    parser.add_argument("--asr-ms", type=float, default=300, help="Stub transcription latency")
+    parser.add_argument("--llm-ms", type=float, default=500, help="Stub LLM latency")
+    parser.add_argument("--tts-ms", type=float, default=400, help="Stub TTS latency per chunk")
+    parser.add_argument("--reply-chars", type=int, default=120, help="Stub LLM reply length")
+    parser.add_argument("--json", help="Write the summary to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.serve_stubs:
+        serve_stubs(args)
+        return
+    summary = asyncio.run(run(args))
+    print_report(summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        print(f"💾 Summary written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 """Utilities package."""
 from .webrtc import create_rtc_configuration, parse_ice_candidate
+from .audio import split_text, crossfade, wav_bytes
 
-__all__ = ['create_rtc_configuration', 'parse_ice_candidate']
\ No newline at end of file
+__all__ = ['create_rtc_configuration', 'parse_ice_candidate', 'split_text', 'crossfade', 'wav_bytes']
\ No newline at end of file
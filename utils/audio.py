@@ -0,0 +1,93 @@
+"""Text chunking and audio stitching helpers for TTS."""
+import io
+import re
+import wave
+import numpy as np
+
+# Sentence and clause boundaries (Latin and Arabic punctuation)
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?؟\n])\s+|(?<=[,،;؛])\s+")
+
+
+def split_text(text: str, max_chars: int) -> list:
+    """
+    Split text into chunks no longer than max_chars.
+
+    Splits on sentence/clause punctuation first and packs the pieces into
+    chunks; pieces that are still too long are split on word boundaries.
+
+    Args:
+        text: Text to split
+        max_chars: Maximum characters per chunk
+
+    Returns:
+        List of non-empty text chunks, in order
+    """
+    text = text.strip()
+    if not text:
+        return []
+    if len(text) <= max_chars:
+        return [text]
+
+    pieces = []
+    for sentence in _SENTENCE_SPLIT.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        # No usable punctuation - fall back to word boundaries
+        current = ""
+        for word in sentence.split():
+            candidate = f"{current} {word}" if current else word
+            if len(candidate) <= max_chars or not current:
+                current = candidate
+            else:
+                pieces.append(current)
+                current = word
+        if current:
+            pieces.append(current)
+
+    chunks = []
+    current = ""
+    for piece in pieces:
+        candidate = f"{current} {piece}" if current else piece
+        if len(candidate) <= max_chars or not current:
+            current = candidate
+        else:
+            chunks.append(current)
+            current = piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def crossfade(tail: np.ndarray, head: np.ndarray) -> np.ndarray:
+    """
+    Crossfade the tail of one chunk into the start of the next.
+
+    Args:
+        tail: Last samples of the previous chunk
+        head: Samples of the next chunk
+
+    Returns:
+        The next chunk with the tail mixed into its first samples
+    """
+    n = min(len(tail), len(head))
+    if n == 0:
+        return np.concatenate([tail, head])
+    fade_in = np.linspace(0.0, 1.0, n, dtype=np.float32)
+    mixed = tail[:n] * (1.0 - fade_in) + head[:n] * fade_in
+    return np.concatenate([tail[n:], mixed, head[n:]]).astype(np.float32)
+
+
+def wav_bytes(samples: np.ndarray, sample_rate: int) -> bytes:
+    """Encode float samples in [-1, 1] as 16-bit mono WAV bytes."""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(pcm.tobytes())
+    return buffer.getvalue()